@@ -4,12 +4,29 @@ Job Skills Analyzer Agent
 Analyzes job market data for ANY job title and generates personalized daily challenges
 """
 
+import argparse
+import csv
+import errno
+import gzip
+import hashlib
 import json
 import os
+import random
+import re
 import shutil
 import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 import requests
 
 # Configuration
@@ -18,10 +35,271 @@ CONFIG_FILE = "config.json"
 PROGRESS_FILE = "data/progress.json"
 SKILLS_FILE = "data/current_skills.json"
 DATA_DIR = "data"
+# Directory holding the active profile's resume (see set_profile)
+PROFILE_DIR = DATA_DIR
+PROFILES_DIR = os.path.join(DATA_DIR, "profiles")
+DEFAULT_PROFILE = "default"
 RESUME_EXTENSIONS = (".txt", ".docx", ".pdf")
 # Default path when saving resume from setup (pasted or imported)
 DEFAULT_RESUME_SAVE = os.path.join(DATA_DIR, "resume.txt")
 
+# Content-keyed store of postings and analyses shared by all profiles
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+# data/, data/profiles/ and data/cache/ are group-writable (setgid, so new files
+# keep the group) and lock files group-writable, so a team can share one install
+# under different OS users that belong to a common group
+SHARED_DIR_MODE = 0o2775
+LOCK_FILE_MODE = 0o664
+POSTINGS_CACHE_TTL = float(os.environ.get("POSTINGS_CACHE_TTL_HOURS", "24")) * 3600
+ANALYSES_CACHE_TTL = float(os.environ.get("ANALYSES_CACHE_TTL_HOURS", str(7 * 24))) * 3600
+
+# Local posting dumps (.jsonl / .csv, optionally .gz)
+JOB_BATCH_SIZE = 5  # postings per analysis call, same as a JSearch fetch
+MAX_JOB_BATCHES = 20  # analysis calls per run; 0 = analyze every batch
+INGEST_REPORT_EVERY = 100000  # rows between throughput reports
+DESCRIPTION_LIMIT = 1500
+# Ways a country-level target location shows up in posting dumps (JSearch uses ISO codes)
+COUNTRY_ALIASES = {
+    "united states": {"united states", "united states of america", "usa", "us", "u.s.", "u.s.a."},
+    "usa": {"united states", "united states of america", "usa", "us", "u.s.", "u.s.a."},
+    "united kingdom": {"united kingdom", "uk", "gb", "great britain", "england", "scotland", "wales"},
+    "uk": {"united kingdom", "uk", "gb", "great britain", "england", "scotland", "wales"},
+}
+US_STATE_CODES = {
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "dc", "fl", "ga", "hi", "id", "il", "in",
+    "ia", "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo", "mt", "ne", "nv", "nh",
+    "nj", "nm", "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri", "sc", "sd", "tn", "tx", "ut",
+    "vt", "va", "wa", "wv", "wi", "wy",
+}
+
+# Groq model routing
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+MODEL_STATS_FILE = os.path.join(DATA_DIR, "model_stats.json")
+SMALL_MODEL = "llama-3.1-8b-instant"
+LARGE_MODEL = "llama-3.3-70b-versatile"
+# Each stage tries its models in order and escalates to the next one when the
+# output fails validation or the call exceeds the stage's latency budget (seconds).
+# Override a stage's cascade with e.g. GROQ_SKILLS_MODELS="model-a,model-b".
+STAGE_CONFIG = {
+    "skills": {
+        "models": os.environ.get("GROQ_SKILLS_MODELS", f"{SMALL_MODEL},{LARGE_MODEL}"),
+        "max_tokens": 1500,  # ~10 skills x ~100 tokens + summaries
+        "latency_budget": float(os.environ.get("GROQ_SKILLS_BUDGET", "15")),
+    },
+    "challenge": {
+        "models": os.environ.get("GROQ_CHALLENGE_MODELS", f"{SMALL_MODEL},{LARGE_MODEL}"),
+        "max_tokens": 800,  # title + 4-6 steps + skills line
+        "latency_budget": float(os.environ.get("GROQ_CHALLENGE_BUDGET", "10")),
+    },
+    "resume_match": {
+        "models": os.environ.get("GROQ_RESUME_MATCH_MODELS", f"{SMALL_MODEL},{LARGE_MODEL}"),
+        "max_tokens": 600,  # one flag per skill + gap summary
+        "latency_budget": float(os.environ.get("GROQ_RESUME_MATCH_BUDGET", "10")),
+    },
+    "summary": {
+        "models": os.environ.get("GROQ_SUMMARY_MODELS", f"{SMALL_MODEL},{LARGE_MODEL}"),
+        "max_tokens": 400,  # two short paragraphs
+        "latency_budget": float(os.environ.get("GROQ_SUMMARY_BUDGET", "10")),
+    },
+}
+# Timeout for the last model in a cascade (nothing left to escalate to)
+FINAL_MODEL_TIMEOUT = 30
+
+
+def set_profile(name):
+    """
+    Point the config, progress, skills and resume paths at a named profile.
+    The default profile keeps the original top-level paths.
+    """
+    global CONFIG_FILE, PROGRESS_FILE, SKILLS_FILE, PROFILE_DIR, DEFAULT_RESUME_SAVE
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+        print(f"ERROR: Invalid profile name '{name}' (use letters, digits, '-' or '_')")
+        sys.exit(1)
+    if name == DEFAULT_PROFILE:
+        PROFILE_DIR = DATA_DIR
+        CONFIG_FILE = "config.json"
+    else:
+        PROFILE_DIR = os.path.join(PROFILES_DIR, name)
+        CONFIG_FILE = os.path.join(PROFILE_DIR, "config.json")
+    PROGRESS_FILE = os.path.join(PROFILE_DIR, "progress.json")
+    SKILLS_FILE = os.path.join(PROFILE_DIR, "current_skills.json")
+    DEFAULT_RESUME_SAVE = os.path.join(PROFILE_DIR, "resume.txt")
+
+
+def current_umask():
+    """Return the process umask (os.umask can only be read by setting it)"""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def is_shared_dir(directory):
+    """True for directories every profile writes to (data/, data/profiles/, data/cache/...)"""
+    directory = os.path.normpath(directory)
+    cache_dir = os.path.normpath(CACHE_DIR)
+    return (
+        directory in (os.path.normpath(DATA_DIR), os.path.normpath(PROFILES_DIR), cache_dir)
+        or directory.startswith(cache_dir + os.sep)
+    )
+
+
+def make_dirs(directory):
+    """os.makedirs(exist_ok=True), making newly created shared directories group-writable"""
+    if not directory or os.path.isdir(directory):
+        return
+    make_dirs(os.path.dirname(directory))
+    try:
+        os.mkdir(directory)
+    except FileExistsError:
+        return
+    if is_shared_dir(directory):
+        try:
+            os.chmod(directory, SHARED_DIR_MODE)
+        except OSError:
+            pass
+
+
+def open_lock_file(lock_path):
+    """
+    Open (creating if needed) a lock file. New lock files are made
+    group-writable; another user's lock file is opened read-only if it can't
+    be opened for writing, which is enough for flock.
+    """
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT | os.O_EXCL, LOCK_FILE_MODE)
+        try:
+            os.chmod(lock_path, LOCK_FILE_MODE)  # undo the umask
+        except OSError:
+            pass
+        return os.fdopen(fd, "r+")
+    except FileExistsError:
+        pass
+    try:
+        return open(lock_path, "r+")
+    except PermissionError:
+        return open(lock_path, "r")
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on path + '.lock' across processes (blocks until free)"""
+    lock_path = path + ".lock"
+    make_dirs(os.path.dirname(lock_path))
+    with open_lock_file(lock_path) as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting on that only
+                    if e.errno not in (errno.EDEADLK, errno.EACCES):
+                        raise
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json_atomic(path, data):
+    """
+    Write JSON to a temp file in the same directory and rename it over path,
+    so readers never see a half-written file. Callers doing read-modify-write
+    should hold file_lock(path).
+    """
+    directory = os.path.dirname(path) or "."
+    make_dirs(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        # mkstemp creates files 0600; use the normal umask-based mode instead
+        os.chmod(tmp_path, 0o666 & ~current_umask())
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def cache_entry_path(kind, *parts):
+    """Path in the shared cache for content identified by parts"""
+    key = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, kind, key + ".json")
+
+
+def cache_lock(path):
+    """
+    Lock a single cache entry while it is read or computed. Each key has its
+    own lock file, so only runs for the same search wait on each other;
+    prune_cache removes lock files along with expired entries.
+    """
+    return file_lock(path)
+
+
+def load_cache_entry(path, max_age=None):
+    """Return cached data, or None if missing, unreadable or older than max_age seconds"""
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if max_age is not None and time.time() - entry.get("created", 0) > max_age:
+        return None
+    return entry.get("data")
+
+
+def save_cache_entry(path, data):
+    """Store data in the shared cache"""
+    try:
+        write_json_atomic(path, {"created": time.time(), "data": data})
+    except OSError as e:
+        print(f"WARNING: Could not write cache entry: {e}")
+
+
+def prune_cache():
+    """
+    Delete shared cache entries older than their TTL, with their lock files.
+    Lock files left behind by failed computations are removed once they are
+    older than the TTL. Removing a lock file another run still holds can at
+    worst cause one duplicate computation; writes are atomic either way.
+    """
+    for kind, max_age in (("postings", POSTINGS_CACHE_TTL), ("analyses", ANALYSES_CACHE_TTL)):
+        directory = os.path.join(CACHE_DIR, kind)
+        if not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            try:
+                if name.endswith(".json.lock"):
+                    entry = path[:-len(".lock")]
+                    if not os.path.exists(entry) and time.time() - os.path.getmtime(path) > max_age:
+                        os.remove(path)
+                    continue
+                if not name.endswith(".json") or name.startswith(".tmp-"):
+                    continue
+                if time.time() - os.path.getmtime(path) <= max_age:
+                    continue
+                with cache_lock(path):
+                    # Re-check under the lock in case another run just refreshed it
+                    if time.time() - os.path.getmtime(path) <= max_age:
+                        continue
+                    os.remove(path)
+                os.remove(path + ".lock")
+            except OSError:
+                pass
+
 
 def load_config():
     """Load user configuration"""
@@ -31,6 +309,12 @@ def load_config():
     return None
 
 
+def save_config(config):
+    """Save user configuration"""
+    with file_lock(CONFIG_FILE):
+        write_json_atomic(CONFIG_FILE, config)
+
+
 def setup_configuration(is_update=False):
     """Interactive setup for first-time users or configuration update"""
     print("\n" + "=" * 70)
@@ -87,7 +371,7 @@ def setup_configuration(is_update=False):
                 resume_text = "\n".join(resume_lines)
                 
                 # Save resume
-                os.makedirs(DATA_DIR, exist_ok=True)
+                make_dirs(PROFILE_DIR)
                 with open(DEFAULT_RESUME_SAVE, 'w', encoding='utf-8') as f:
                     f.write(resume_text)
                 resume_path = DEFAULT_RESUME_SAVE
@@ -103,19 +387,19 @@ def setup_configuration(is_update=False):
                     if ext == ".txt":
                         with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
                             resume_text = f.read()
-                        os.makedirs(DATA_DIR, exist_ok=True)
+                        make_dirs(PROFILE_DIR)
                         with open(DEFAULT_RESUME_SAVE, 'w', encoding='utf-8') as f:
                             f.write(resume_text)
                         resume_path = DEFAULT_RESUME_SAVE
                     elif ext in (".docx", ".pdf"):
-                        os.makedirs(DATA_DIR, exist_ok=True)
-                        dest = os.path.join(DATA_DIR, "resume" + ext)
+                        make_dirs(PROFILE_DIR)
+                        dest = os.path.join(PROFILE_DIR, "resume" + ext)
                         src_abs = os.path.abspath(file_path)
                         dest_abs = os.path.abspath(dest)
                         if os.path.normpath(src_abs) == os.path.normpath(dest_abs) or (
                             os.path.exists(dest_abs) and os.path.samefile(src_abs, dest_abs)
                         ):
-                            # File is already in data/ with resume name; no copy needed
+                            # File is already in the profile dir with resume name; no copy needed
                             resume_path = dest
                             print("Resume already in place.")
                         else:
@@ -142,8 +426,7 @@ def setup_configuration(is_update=False):
         "last_run": None
     }
     
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    save_config(config)
     
     print("\n" + "=" * 70)
     print("SETUP COMPLETE!")
@@ -151,7 +434,7 @@ def setup_configuration(is_update=False):
     print(f"\nTarget Job: {job_title}")
     print(f"Location: {location}")
     print(f"Resume: {'Added' if resume_path else 'Not added (you can add it later)'}")
-    print("\nYou can change these settings anytime by editing config.json")
+    print(f"\nYou can change these settings anytime by editing {CONFIG_FILE}")
     print("or deleting it and running setup again.\n")
     
     return config
@@ -160,6 +443,7 @@ def setup_configuration(is_update=False):
 def fetch_job_listings(config):
     """
     Fetch jobs based on user's target job title
+    Live results are cached by (job_title, location) and shared by all profiles.
     """
     
     rapid_api_key = os.environ.get("RAPID_API_KEY", "")
@@ -171,6 +455,25 @@ def fetch_job_listings(config):
         print("To use real jobs: Get key at rapidapi.com/jsearch\n")
         return get_sample_jobs(job_title)
     
+    cache_path = cache_entry_path("postings", job_title.strip().lower(), location.strip().lower())
+    # Concurrent runs for the same search wait here and reuse the first fetch
+    with cache_lock(cache_path):
+        jobs = load_cache_entry(cache_path, max_age=POSTINGS_CACHE_TTL)
+        if jobs is not None:
+            print(f"Using cached {job_title} jobs in {location} ({len(jobs)} postings)\n")
+            return jobs
+        
+        jobs = fetch_jsearch_jobs(job_title, location, rapid_api_key)
+        if jobs is None:
+            print("Using sample data instead\n")
+            return get_sample_jobs(job_title)
+        
+        save_cache_entry(cache_path, jobs)
+        return jobs
+
+
+def fetch_jsearch_jobs(job_title, location, rapid_api_key):
+    """Fetch jobs from the JSearch API. Returns None on failure."""
     print(f"Fetching {job_title} jobs in {location}...")
     
     try:
@@ -203,16 +506,15 @@ def fetch_job_listings(config):
             print(f"SUCCESS: Found {len(jobs)} {job_title} jobs\n")
             return jobs
         else:
-            print(f"WARNING: API returned status {response.status_code}, using sample data\n")
-            return get_sample_jobs(job_title)
+            print(f"WARNING: API returned status {response.status_code}")
+            return None
             
     except requests.exceptions.Timeout:
-        print("WARNING: Request timed out, using sample data\n")
-        return get_sample_jobs(job_title)
+        print("WARNING: Request timed out")
+        return None
     except Exception as e:
         print(f"WARNING: Error fetching jobs: {e}")
-        print("Using sample data instead\n")
-        return get_sample_jobs(job_title)
+        return None
 
 
 def get_sample_jobs(job_title):
@@ -272,9 +574,342 @@ def get_sample_jobs(job_title):
     ]
 
 
+def open_postings_file(path):
+    """Open a posting dump for text reading, decompressing .gz on the fly"""
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace", newline="")
+    return open(path, "r", encoding="utf-8", errors="replace", newline="")
+
+
+def iter_posting_rows(path, stats):
+    """Yield raw rows (dicts) from a .jsonl or .csv dump, one at a time."""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    with open_postings_file(path) as f:
+        if name.endswith(".csv"):
+            try:
+                csv.field_size_limit(sys.maxsize)
+            except OverflowError:
+                # C long is 32-bit on Windows
+                csv.field_size_limit(2**31 - 1)
+            for row in csv.DictReader(f):
+                stats["rows"] += 1
+                yield row
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                stats["rows"] += 1
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    stats["bad_rows"] += 1
+                    continue
+                if isinstance(row, dict):
+                    yield row
+                else:
+                    stats["bad_rows"] += 1
+
+
+def normalize_posting(row):
+    """Map a raw row (JSearch export or simple title/company/description) to a job dict"""
+    location_parts = [
+        row.get(key) for key in ("location", "job_location", "job_city", "job_state", "job_country")
+        if row.get(key)
+    ]
+    # JSON gives a bool, CSV gives a string
+    is_remote = row.get("remote", row.get("job_is_remote"))
+    return {
+        "title": str(row.get("title") or row.get("job_title") or "Unknown").strip(),
+        "company": str(row.get("company") or row.get("employer_name") or "Unknown").strip(),
+        "location": ", ".join(str(part) for part in location_parts),
+        # Kept separately so country-level matching doesn't guess from the joined string
+        "state": str(row.get("state") or row.get("job_state") or "").strip(),
+        "country": str(row.get("country") or row.get("job_country") or "").strip(),
+        "remote": str(is_remote).strip().lower() in ("true", "1", "yes"),
+        "description": str(row.get("description") or row.get("job_description") or "")[:DESCRIPTION_LIMIT]
+    }
+
+
+def whole_word_pattern(text):
+    """
+    Regex matching text as a whole word. Uses lookarounds rather than \\b so
+    words like "C++", "C#" and ".NET" still match.
+    """
+    return rf"(?<!\w){re.escape(text)}(?!\w)"
+
+
+def location_matches(target, job):
+    """
+    Check a posting against the configured location.
+    
+    "Remote" matches remote postings. Country targets ("United States", "UK")
+    match the posting's country field when it has one. Otherwise they match
+    a country name or code in the location string, or for the US a bare
+    "City, ST" location with a state code. Other targets match when the first
+    part ("Dallas" in "Dallas, TX") appears as a whole word. Postings without
+    a location are kept.
+    """
+    target = (target or "").strip().lower()
+    location = job["location"].lower()
+    if not target:
+        return True
+    if target == "remote":
+        return job["remote"] or re.search(r"\bremote\b", location) is not None
+    if not location:
+        return True
+    aliases = COUNTRY_ALIASES.get(target)
+    if aliases:
+        country = job["country"].lower()
+        if country:
+            return country in aliases
+        parts = [part.strip() for part in location.split(",")]
+        if any(part in aliases for part in parts):
+            return True
+        # "Austin, TX" is US; "Toronto, ON, CA" ends in a (non-US) country code
+        state = job["state"].lower() or (parts[-1] if len(parts) == 2 else "")
+        return "us" in aliases and state in US_STATE_CODES
+    primary = target.split(",")[0].strip()
+    return re.search(whole_word_pattern(primary), location) is not None
+
+
+def filter_postings(postings, job_title, location=None):
+    """
+    Keep postings whose title contains every word of job_title (as whole words)
+    and whose location matches (see location_matches). Pass location=None to
+    keep every location.
+    """
+    title_patterns = [re.compile(whole_word_pattern(word)) for word in job_title.lower().split()]
+    for job in postings:
+        title = job["title"].lower()
+        if not all(pattern.search(title) for pattern in title_patterns):
+            continue
+        if location is not None and not location_matches(location, job):
+            continue
+        yield job
+
+
+def dedupe_postings(postings):
+    """
+    Drop repeated postings (same title, company and description).
+    Only an 8-byte digest is kept per unique matching posting, but as Python
+    objects in a set that is roughly 100 bytes each: memory grows with the
+    number of unique matches (~100 MB per million), not with file size.
+    """
+    seen = set()
+    for job in postings:
+        key = "\x1f".join((job["title"].lower(), job["company"].lower(), job["description"].strip().lower()))
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        yield job
+
+
+def batch_postings(postings, batch_size):
+    """Group postings into lists of at most batch_size"""
+    batch = []
+    for job in postings:
+        batch.append(job)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def sample_postings(postings, k, rng=None):
+    """
+    Reservoir-sample k postings from the whole stream, so a capped analysis
+    covers the entire file rather than its first rows. Memory is bounded by k.
+    """
+    rng = rng or random.Random()
+    sample = []
+    for i, job in enumerate(postings):
+        if i < k:
+            sample.append(job)
+        else:
+            j = rng.randrange(i + 1)
+            if j < k:
+                sample[j] = job
+    return sample
+
+
+def report_ingest_rate(stats, final=False, finished=True):
+    """Print rows read and throughput (time spent waiting on the consumer is excluded)"""
+    elapsed = stats["seconds"]
+    if stats.get("resumed") is not None:
+        elapsed += time.monotonic() - stats["resumed"]
+    rate = stats["rows"] / elapsed if elapsed > 0 else 0.0
+    if not final:
+        label = "Ingest progress"
+    else:
+        label = "Ingest complete" if finished else "Ingest stopped"
+    print(f"{label}: {stats['rows']:,} rows read, {stats['kept']:,} matching postings "
+          f"({rate:,.0f} rows/sec)")
+    if final and stats["bad_rows"]:
+        print(f"WARNING: Skipped {stats['bad_rows']:,} malformed rows")
+
+
+def track_ingest_progress(rows, stats):
+    """Pass rows through, reporting throughput every INGEST_REPORT_EVERY rows read"""
+    next_report = INGEST_REPORT_EVERY
+    for row in rows:
+        if stats["rows"] >= next_report:
+            report_ingest_rate(stats)
+            next_report = stats["rows"] + INGEST_REPORT_EVERY
+        yield row
+
+
+def ingest_job_file(path, config, stats=None, filter_location=True):
+    """
+    Stream a local posting dump through normalize -> filter -> de-duplicate
+    and yield matching postings one at a time.
+    
+    Rows are read lazily, so memory does not grow with file size; only the
+    de-duplication set grows, with the number of unique matches. Throughput
+    is reported while reading and once more when the generator finishes or
+    is closed early. A read error (e.g. a truncated .gz export) ends the
+    stream with a warning, so the postings read up to that point can still
+    be analyzed. Pass a stats dict to read the counters afterwards.
+    """
+    if stats is None:
+        stats = {}
+    stats.update({"rows": 0, "bad_rows": 0, "kept": 0, "seconds": 0.0, "resumed": None})
+    
+    rows = track_ingest_progress(iter_posting_rows(path, stats), stats)
+    postings = (normalize_posting(row) for row in rows)
+    postings = filter_postings(postings, config["job_title"], config["location"] if filter_location else None)
+    postings = dedupe_postings(postings)
+    
+    print(f"Reading {config['job_title']} postings from {path}...")
+    finished = False
+    try:
+        while True:
+            stats["resumed"] = time.monotonic()
+            try:
+                job = next(postings, None)
+            except (OSError, EOFError, zlib.error, csv.Error, UnicodeError) as e:
+                # gzip.BadGzipFile is an OSError; EOFError means a truncated .gz
+                print(f"WARNING: Could not finish reading {path} after {stats['rows']:,} rows: {e}")
+                print(f"Continuing with the {stats['kept']:,} matching postings read so far")
+                break
+            stats["seconds"] += time.monotonic() - stats["resumed"]
+            stats["resumed"] = None
+            if job is None:
+                finished = True
+                break
+            stats["kept"] += 1
+            yield job
+    finally:
+        if stats["resumed"] is not None:
+            stats["seconds"] += time.monotonic() - stats["resumed"]
+            stats["resumed"] = None
+        report_ingest_rate(stats, final=True, finished=finished)
+
+
+def merge_skills_data(merged, skills_data, batch_jobs):
+    """
+    Fold one batch's skills analysis into the running totals.
+    Skills are matched case-insensitively and their job counts summed.
+    The first batch's summary is kept as a fallback for summarize_skills_with_groq.
+    """
+    if merged is None:
+        merged = {
+            "skills": {},
+            "summary": skills_data.get("summary", ""),
+            "summary_jobs": batch_jobs,
+            "num_jobs": 0
+        }
+    merged["num_jobs"] += batch_jobs
+    for skill in skills_data.get("top_skills", []):
+        key = skill["skill"].strip().lower()
+        try:
+            job_count = int(skill.get("job_count") or 0)
+        except (TypeError, ValueError):
+            job_count = 0
+        entry = merged["skills"].get(key)
+        if entry is None:
+            entry = dict(skill, job_count=0)
+            merged["skills"][key] = entry
+        entry["job_count"] += min(job_count, batch_jobs)
+    return merged
+
+
+def finalize_skills_data(merged):
+    """
+    Turn merged batch totals into the skills_data shape used by the report.
+    The summary is the first batch's, labelled as such, until replaced by
+    summarize_skills_with_groq.
+    """
+    num_jobs = merged["num_jobs"]
+    top_skills = sorted(merged["skills"].values(), key=lambda s: s["job_count"], reverse=True)[:10]
+    for skill in top_skills:
+        share = skill["job_count"] / num_jobs if num_jobs else 0
+        skill["importance"] = "High" if share >= 0.5 else "Medium" if share >= 0.2 else "Low"
+    sample_label = f"(Based on a sample of {merged['summary_jobs']} postings) "
+    return {"top_skills": top_skills, "summary": sample_label + merged["summary"]}
+
+
+def analyze_job_file(path, config, batch_size=JOB_BATCH_SIZE, max_batches=MAX_JOB_BATCHES,
+                     filter_location=True):
+    """
+    Analyze postings from a local dump in bounded batches and merge the results.
+    
+    With max_batches set, the whole file is read and a random sample of
+    max_batches * batch_size matching postings is analyzed; with max_batches=0
+    every matching posting is analyzed as it streams in. A final call
+    summarizes the merged skill counts.
+    Returns (skills_data, num_jobs), or (None, 0) if nothing could be analyzed.
+    """
+    if not os.path.isfile(path):
+        print(f"ERROR: Jobs file not found: {path}")
+        return None, 0
+    
+    stats = {}
+    postings = ingest_job_file(path, config, stats, filter_location=filter_location)
+    merged = None
+    try:
+        if max_batches:
+            sample = sample_postings(postings, max_batches * batch_size)
+            if stats["kept"] > len(sample):
+                print(f"INFO: Analyzing a random sample of {len(sample):,} of {stats['kept']:,} "
+                      f"matching postings (use --max-batches 0 for all)\n")
+            batches = batch_postings(sample, batch_size)
+        else:
+            batches = batch_postings(postings, batch_size)
+        
+        print("Analyzing skills with Groq AI...\n")
+        for batch in batches:
+            try:
+                skills_data = extract_market_skills(batch, config)
+            except Exception as e:
+                print(f"ERROR: Error analyzing skills: {e}")
+                skills_data = None
+            if skills_data:
+                merged = merge_skills_data(merged, skills_data, len(batch))
+    finally:
+        postings.close()
+    
+    if merged is None:
+        return None, 0
+    
+    skills_data = finalize_skills_data(merged)
+    summaries = summarize_skills_with_groq(skills_data, merged["num_jobs"], config)
+    if summaries:
+        skills_data.update(summaries)
+    resume_text = load_resume()
+    if resume_text:
+        skills_data = match_resume_skills(skills_data, resume_text, config)
+    write_json_atomic(SKILLS_FILE, skills_data)
+    return skills_data, merged["num_jobs"]
+
+
 def find_resume_file():
-    """Find first file in data/ whose name contains 'resume' and has extension .txt, .docx, or .pdf."""
-    if not os.path.isdir(DATA_DIR):
+    """Find first file in the profile dir whose name contains 'resume' and has extension .txt, .docx, or .pdf."""
+    if not os.path.isdir(PROFILE_DIR):
         return None
     # Skip temp/lock files (e.g. Word ~$resume.docx)
     def is_resume_file(name):
@@ -283,10 +918,10 @@ def find_resume_file():
         return "resume" in name.lower()
     # Prefer .txt, then .docx, then .pdf
     by_ext = {ext: [] for ext in RESUME_EXTENSIONS}
-    for name in os.listdir(DATA_DIR):
+    for name in os.listdir(PROFILE_DIR):
         if not is_resume_file(name):
             continue
-        path = os.path.join(DATA_DIR, name)
+        path = os.path.join(PROFILE_DIR, name)
         if not os.path.isfile(path):
             continue
         ext = os.path.splitext(name)[1].lower()
@@ -299,7 +934,7 @@ def find_resume_file():
 
 
 def load_resume():
-    """Load resume text from data/ (any file with 'resume' in name, .txt / .docx / .pdf)."""
+    """Load resume text from the profile dir (any file with 'resume' in name, .txt / .docx / .pdf)."""
     path = find_resume_file()
     if not path:
         return None
@@ -336,50 +971,209 @@ def load_resume():
     return None
 
 
-def analyze_skills_with_groq(job_listings, config):
+def extract_json(response_text):
+    """Parse JSON from a model response, stripping markdown code fences if present"""
+    response_text = response_text.strip()
+    if "```json" in response_text:
+        json_start = response_text.find("```json") + 7
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    elif "```" in response_text:
+        json_start = response_text.find("```") + 3
+        json_end = response_text.find("```", json_start)
+        response_text = response_text[json_start:json_end].strip()
+    return json.loads(response_text)
+
+
+def validate_skills_response(response_text):
+    """Return parsed skills data, or None if the response is not usable."""
+    try:
+        skills_data = extract_json(response_text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(skills_data, dict):
+        return None
+    top_skills = skills_data.get("top_skills")
+    if not isinstance(top_skills, list) or not top_skills:
+        return None
+    for skill in top_skills:
+        if not isinstance(skill, dict) or not skill.get("skill"):
+            return None
+    return skills_data
+
+
+def validate_resume_match_response(response_text, skill_names):
+    """Return the parsed resume match, or None if any skill is missing a user_has flag."""
+    try:
+        match = extract_json(response_text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(match, dict) or not isinstance(match.get("skill_gap_summary"), str):
+        return None
+    user_has = match.get("user_has")
+    if not isinstance(user_has, dict):
+        return None
+    flags = {}
+    for name, value in user_has.items():
+        if isinstance(value, str):
+            value = value.strip().lower() in ("true", "yes", "1")
+        flags[str(name).strip().lower()] = bool(value)
+    if any(name.strip().lower() not in flags for name in skill_names):
+        return None
+    return {"user_has": flags, "skill_gap_summary": match["skill_gap_summary"]}
+
+
+def validate_challenge_response(response_text):
+    """Return the challenge text, or None if any required section header is missing."""
+    lowered = response_text.lower()
+    if all(header in lowered for header in ("title:", "what to do:", "skills practiced:")):
+        return response_text
+    return None
+
+
+def load_model_stats():
+    """Load per-stage model usage stats"""
+    if os.path.exists(MODEL_STATS_FILE):
+        try:
+            with open(MODEL_STATS_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    return {}
+
+
+def record_model_usage(stage, model, escalations, elapsed):
     """
-    Use Groq API to analyze skills
+    Log which model served a stage and update its escalation rate.
+    model is None when every model in the cascade failed.
+    Returns the updated stats for the stage.
     """
-    if not GROQ_API_KEY:
-        print("ERROR: GROQ_API_KEY not set!\n")
-        print("Get your API key:")
-        print("1. Go to: https://console.groq.com")
-        print("2. Sign up")
-        print("3. Go to 'API Keys' and create one")
-        print("4. Set it: export GROQ_API_KEY='your-key-here'\n")
-        return None
+    try:
+        with file_lock(MODEL_STATS_FILE):
+            stats = load_model_stats()
+            stage_stats = stats.setdefault(stage, {
+                "calls": 0,
+                "escalated": 0,
+                "failed": 0,
+                "models": {},
+                "total_seconds": 0.0
+            })
+            stage_stats["calls"] += 1
+            if escalations:
+                stage_stats["escalated"] += 1
+            if model is None:
+                stage_stats["failed"] += 1
+            else:
+                stage_stats["models"][model] = stage_stats["models"].get(model, 0) + 1
+            stage_stats["total_seconds"] = round(stage_stats["total_seconds"] + elapsed, 3)
+            write_json_atomic(MODEL_STATS_FILE, stats)
+    except OSError as e:
+        print(f"WARNING: Could not save model stats: {e}")
+        stage_stats = {"calls": 1, "escalated": 1 if escalations else 0}
+    return stage_stats
+
+
+def call_groq(stage, messages, temperature, validate):
+    """
+    Run a chat completion through the model cascade configured for a stage.
     
-    print("Analyzing skills with Groq AI...\n")
+    Each model is tried in order. A model is skipped in favour of the next one
+    when its call fails, exceeds the stage latency budget, or validate(content)
+    returns None. Returns the first validated result, or None if all models fail.
+    """
+    stage_config = STAGE_CONFIG[stage]
+    models = [m.strip() for m in stage_config["models"].split(",") if m.strip()]
+    
+    headers = {
+        "Authorization": f"Bearer {GROQ_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    
+    escalations = 0
+    total_elapsed = 0.0
+    for i, model in enumerate(models):
+        is_last = i == len(models) - 1
+        timeout = FINAL_MODEL_TIMEOUT if is_last else stage_config["latency_budget"]
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": stage_config["max_tokens"]
+        }
+        
+        start = time.monotonic()
+        result = None
+        try:
+            response = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=timeout)
+            if response.status_code == 200:
+                content = response.json()['choices'][0]['message']['content'].strip()
+                result = validate(content)
+                reason = "returned invalid output"
+            else:
+                reason = f"returned API error {response.status_code}: {response.text[:200]}"
+        except requests.exceptions.Timeout:
+            reason = f"exceeded {timeout:g}s latency budget"
+        except requests.exceptions.RequestException as e:
+            reason = f"request failed: {e}"
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            # Non-JSON body or unexpected response shape
+            reason = f"returned a malformed response: {e!r}"
+        elapsed = time.monotonic() - start
+        total_elapsed += elapsed
+        
+        if result is not None:
+            stage_stats = record_model_usage(stage, model, escalations, total_elapsed)
+            rate = stage_stats["escalated"] / stage_stats["calls"]
+            print(f"Model: {model} ({elapsed:.1f}s) - {stage} escalation rate "
+                  f"{rate:.0%} over {stage_stats['calls']} run(s)\n")
+            return result
+        
+        if is_last:
+            print(f"ERROR: {model} {reason}")
+        else:
+            print(f"INFO: {model} {reason}, escalating to {models[i + 1]}")
+            escalations += 1
     
+    record_model_usage(stage, None, escalations, total_elapsed)
+    return None
+
+
+def check_groq_key():
+    """Return True if GROQ_API_KEY is set, otherwise print setup instructions"""
+    if GROQ_API_KEY:
+        return True
+    print("ERROR: GROQ_API_KEY not set!\n")
+    print("Get your API key:")
+    print("1. Go to: https://console.groq.com")
+    print("2. Sign up")
+    print("3. Go to 'API Keys' and create one")
+    print("4. Set it: export GROQ_API_KEY='your-key-here'\n")
+    return False
+
+
+def extract_market_skills(job_listings, config):
+    """
+    Extract the market skill profile from job postings (no resume involved).
+    
+    Results are cached in the shared store by normalized (job_title, location)
+    and posting content, so every profile tracking the same search reuses one
+    Groq call. Returns skills_data, or None on failure.
+    """
     # Prepare job descriptions
     jobs_text = "\n\n---\n\n".join([
         f"Job {i+1}: {job['title']} at {job['company']}\n{job['description']}"
         for i, job in enumerate(job_listings)
     ])
     
-    # Load resume if available
-    resume_text = load_resume()
-    resume_context = ""
-    if resume_text:
-        resume_context = f"\n\nUser's Current Resume/Background:\n{resume_text[:2000]}\n"
-    
-    resume_instruction = (
-        "5. For EACH skill, set \"user_has\": true if the user's resume clearly shows they have this skill, "
-        "otherwise \"user_has\": false. You MUST include user_has for every skill."
-    ) if resume_text else ""
-    json_user_line = '\n            "user_has": true or false,' if resume_text else ""
-    json_skill_gap = ',\n    "skill_gap_summary": "Brief analysis of user\'s skill gaps based on resume"' if resume_text else ""
     prompt = f"""Analyze these {config['job_title']} job postings and extract the required skills.
 
 {jobs_text}
-{resume_context}
 
 Provide a JSON response with:
 1. Top 10 most frequently mentioned technical skills/tools/competencies
 2. Categorize each appropriately (Technical Skill, Soft Skill, Tool, Certification, etc.)
 3. Count how many jobs mention each skill
 4. Rate importance (High/Medium/Low) based on frequency
-{resume_instruction}
 
 JSON format:
 {{
@@ -389,77 +1183,180 @@ JSON format:
             "category": "Category",
             "job_count": 3,
             "importance": "High",
-            "description": "Why this skill matters"{json_user_line}
+            "description": "Why this skill matters"
         }}
     ],
-    "summary": "Brief market trends summary"{json_skill_gap}
+    "summary": "Brief market trends summary"
 }}
 
 Return ONLY valid JSON, no markdown or extra text."""
     
-    try:
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a career advisor specializing in {config['job_title']} roles. Always respond with valid JSON."
+        },
+        {
+            "role": "user",
+            "content": prompt
         }
-        
-        payload = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": f"You are a career advisor specializing in {config['job_title']} roles. Always respond with valid JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.3,
-            "max_tokens": 2500
+    ]
+    
+    cache_path = cache_entry_path(
+        "analyses", config['job_title'].strip().lower(), config['location'].strip().lower(), jobs_text
+    )
+    with cache_lock(cache_path):
+        skills_data = load_cache_entry(cache_path, max_age=ANALYSES_CACHE_TTL)
+        if skills_data is not None:
+            print("Using cached skills analysis\n")
+            return skills_data
+        skills_data = call_groq("skills", messages, temperature=0.3, validate=validate_skills_response)
+        if skills_data:
+            save_cache_entry(cache_path, skills_data)
+        return skills_data
+
+
+def match_resume_skills(skills_data, resume_text, config):
+    """
+    Mark which market skills the user's resume shows and write a skill gap
+    summary. This is the per-user pass and is never shared between profiles.
+    Returns a new skills_data, or skills_data unchanged if the call fails.
+    """
+    skill_names = [skill["skill"] for skill in skills_data.get("top_skills", [])]
+    skills_list = "\n".join(f"- {name}" for name in skill_names)
+    prompt = f"""These skills are in demand for {config['job_title']} roles:
+
+{skills_list}
+
+User's Current Resume/Background:
+{resume_text[:2000]}
+
+For EACH skill above, set true if the user's resume clearly shows they have this skill,
+otherwise false. You MUST include every skill, spelled exactly as listed.
+
+JSON format:
+{{
+    "user_has": {{
+        "Example Skill": true
+    }},
+    "skill_gap_summary": "Brief analysis of user's skill gaps based on resume"
+}}
+
+Return ONLY valid JSON, no markdown or extra text."""
+    
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a career advisor specializing in {config['job_title']} roles. Always respond with valid JSON."
+        },
+        {
+            "role": "user",
+            "content": prompt
         }
+    ]
+    
+    match = call_groq(
+        "resume_match", messages, temperature=0.2,
+        validate=lambda text: validate_resume_match_response(text, skill_names)
+    )
+    if not match:
+        print("WARNING: Could not compare skills with your resume\n")
+        return skills_data
+    
+    user_has = {name.strip().lower(): value for name, value in match["user_has"].items()}
+    matched = dict(skills_data, skill_gap_summary=match["skill_gap_summary"])
+    matched["top_skills"] = [
+        dict(skill, user_has=user_has[skill["skill"].strip().lower()])
+        for skill in skills_data.get("top_skills", [])
+    ]
+    return matched
+
+
+def analyze_skills_with_groq(job_listings, config, save=True):
+    """
+    Use Groq API to analyze skills
+    Extracts the (shared) market skills, then compares them with the user's
+    resume if one is available. Results are written to SKILLS_FILE unless
+    save is False.
+    """
+    if not check_groq_key():
+        return None
+    
+    print("Analyzing skills with Groq AI...\n")
+    
+    try:
+        skills_data = extract_market_skills(job_listings, config)
+        if not skills_data:
+            return None
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        # Load resume if available
+        resume_text = load_resume()
+        if resume_text:
+            skills_data = match_resume_skills(skills_data, resume_text, config)
         
-        if response.status_code == 200:
-            result = response.json()
-            response_text = result['choices'][0]['message']['content']
-            
-            # Clean response - extract JSON
-            response_text = response_text.strip()
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            
-            skills_data = json.loads(response_text)
-            
-            # Save to file
-            os.makedirs("data", exist_ok=True)
-            with open(SKILLS_FILE, 'w') as f:
-                json.dump(skills_data, f, indent=2)
-            
-            return skills_data
-        else:
-            print(f"ERROR: API Error: {response.status_code}")
-            print(f"Response: {response.text[:200]}")
-            return None
+        # Save to file
+        if save:
+            write_json_atomic(SKILLS_FILE, skills_data)
+        
+        return skills_data
             
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Error parsing JSON response: {e}")
-        print(f"Response was: {response_text[:200]}...")
-        return None
     except Exception as e:
         print(f"ERROR: Error analyzing skills: {e}")
         return None
 
 
+def validate_summary_response(response_text):
+    """Return the parsed summary, or None if the response is not usable."""
+    try:
+        summaries = extract_json(response_text)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(summaries, dict) or not isinstance(summaries.get("summary"), str):
+        return None
+    return {"summary": summaries["summary"]}
+
+
+def summarize_skills_with_groq(skills_data, num_jobs, config):
+    """
+    Write the market summary from skill counts merged across batches, so it
+    describes every analyzed posting rather than one batch.
+    Returns a dict with "summary", or None on failure.
+    """
+    skill_lines = "\n".join(
+        f"- {skill['skill']} ({skill.get('category') or 'Uncategorized'}): {skill['job_count']} of {num_jobs} postings"
+        for skill in skills_data.get("top_skills", [])
+    )
+    prompt = f"""These are the most requested skills across {num_jobs} {config['job_title']} job postings:
+
+{skill_lines}
+
+Write a brief market trends summary based on these counts.
+
+JSON format:
+{{
+    "summary": "Brief market trends summary"
+}}
+
+Return ONLY valid JSON, no markdown or extra text."""
+    
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a career advisor specializing in {config['job_title']} roles. Always respond with valid JSON."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+    
+    try:
+        return call_groq("summary", messages, temperature=0.3, validate=validate_summary_response)
+    except Exception as e:
+        print(f"WARNING: Could not summarize merged results: {e}")
+        return None
+
+
 def display_skills_report(skills_data, config, num_jobs=None):
     """Display the skills analysis in a structured report format"""
     job_count_str = f"{num_jobs} recent job postings" if num_jobs else "recent job postings"
@@ -528,8 +1425,6 @@ def generate_daily_challenge(skills_data, config):
         skills_to_focus = skills_data.get('top_skills', [])[:3]
     
     skills_list = ", ".join([s['skill'] for s in skills_to_focus[:3]])
-    progress = load_progress()
-    challenge_num = progress['total_challenges'] + 1
     
     prompt = f"""You're a career mentor for {config['job_title']} professionals. Create ONE practical challenge.
 
@@ -555,35 +1450,45 @@ Skills practiced: [comma-separated list of skills]
 
 Keep it simple and actionable. No extra intro or outro."""
     
-    try:
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        
-        headers = {
-            "Authorization": f"Bearer {GROQ_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": "llama-3.3-70b-versatile",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": f"You are a practical career mentor for {config['job_title']} who creates beginner-friendly challenges. Always use the exact section headers: Title:, What to do:, Skills practiced:"
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.7,
-            "max_tokens": 1500
+    messages = [
+        {
+            "role": "system",
+            "content": f"You are a practical career mentor for {config['job_title']} who creates beginner-friendly challenges. Always use the exact section headers: Title:, What to do:, Skills practiced:"
+        },
+        {
+            "role": "user",
+            "content": prompt
         }
+    ]
+    
+    try:
+        challenge = call_groq("challenge", messages, temperature=0.7, validate=validate_challenge_response)
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
-        
-        if response.status_code == 200:
-            result = response.json()
-            challenge = result['choices'][0]['message']['content'].strip()
+        if challenge:
+            # Save challenge
+            today = datetime.now().strftime("%Y-%m-%d")
+            challenge_data = {
+                "date": today,
+                "challenge": challenge,
+                "skills_focused": skills_list,
+                "job_title": config['job_title']
+            }
+            
+            # Reload under the lock so concurrent runs don't drop each other's
+            # challenges and each gets its own number
+            with file_lock(PROGRESS_FILE):
+                progress = load_progress()
+                progress['challenges'].append(challenge_data)
+                progress['total_challenges'] += 1
+                save_progress(progress)
+            challenge_num = progress['total_challenges']
+            
+            # Update last run date, keeping any concurrent config changes
+            with file_lock(CONFIG_FILE):
+                current = load_config() or config
+                current['last_run'] = today
+                write_json_atomic(CONFIG_FILE, current)
+            config['last_run'] = today
             
             # Structured Daily Challenge output
             print("\n" + "─" * 70)
@@ -597,27 +1502,9 @@ Keep it simple and actionable. No extra intro or outro."""
             print(f"Progress: {completed} challenges completed")
             print("─" * 70)
             
-            # Save challenge
-            today = datetime.now().strftime("%Y-%m-%d")
-            challenge_data = {
-                "date": today,
-                "challenge": challenge,
-                "skills_focused": skills_list,
-                "job_title": config['job_title']
-            }
-            
-            progress['challenges'].append(challenge_data)
-            progress['total_challenges'] += 1
-            save_progress(progress)
-            
-            # Update last run date
-            config['last_run'] = today
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
-            
             return challenge
         else:
-            print(f"ERROR: Error generating challenge: {response.status_code}")
+            print("ERROR: Error generating challenge")
             return None
             
     except Exception as e:
@@ -641,10 +1528,8 @@ def load_progress():
 
 
 def save_progress(progress):
-    """Save user progress"""
-    os.makedirs("data", exist_ok=True)
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
+    """Save user progress (hold file_lock(PROGRESS_FILE) around load + save)"""
+    write_json_atomic(PROGRESS_FILE, progress)
 
 
 def show_progress(config):
@@ -655,11 +1540,31 @@ def show_progress(config):
     if total > 0:
         print(f"\nProgress: {done}/{total} challenges completed.")
     else:
-        print(f"\nProgress: {total} challenge(s) ready in ./data/")
+        print(f"\nProgress: {total} challenge(s) ready in ./{PROFILE_DIR}/")
+
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Job Skills Analyzer Agent")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help="named profile with its own config, progress and resume (default: %(default)s)")
+    parser.add_argument("--jobs-file", metavar="PATH",
+                        help="analyze postings from a local .jsonl/.csv dump (optionally .gz) instead of JSearch")
+    parser.add_argument("--any-location", action="store_true",
+                        help="with --jobs-file, keep postings from every location")
+    parser.add_argument("--batch-size", type=int, default=JOB_BATCH_SIZE,
+                        help=f"postings per analysis call (default: {JOB_BATCH_SIZE})")
+    parser.add_argument("--max-batches", type=int, default=MAX_JOB_BATCHES,
+                        help=f"maximum analysis calls for --jobs-file, 0 for no limit (default: {MAX_JOB_BATCHES})")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main function"""
+    args = parse_args()
+    set_profile(args.profile)
+    prune_cache()
+    
     print("\n" + "=" * 70)
     print("JOB SKILLS ANALYZER AGENT")
     print("Learn What Employers Actually Want")
@@ -671,6 +1576,8 @@ def main():
         config = setup_configuration()
     else:
         print(f"Configuration loaded:")
+        if args.profile != DEFAULT_PROFILE:
+            print(f"Profile: {args.profile}")
         print(f"Target Role: {config['job_title']}")
         print(f"Location: {config['location']}")
         resume_found = find_resume_file()
@@ -680,22 +1587,35 @@ def main():
             config = setup_configuration(is_update=True)
             print()
 
-    # Step 1: Fetch jobs
-    jobs = fetch_job_listings(config)
-    
-    if not jobs:
-        print("ERROR: No jobs found.")
-        return
-    
-    # Step 2: Analyze with Groq
-    skills_data = analyze_skills_with_groq(jobs, config)
-    
-    if not skills_data:
-        print("ERROR: Could not analyze skills. Please check your GROQ_API_KEY.")
-        return
+    if args.jobs_file:
+        # Steps 1-2: Stream postings from a local dump and analyze in batches
+        if not check_groq_key():
+            return
+        skills_data, num_jobs = analyze_job_file(
+            args.jobs_file, config, batch_size=max(1, args.batch_size), max_batches=args.max_batches,
+            filter_location=not args.any_location
+        )
+        if not skills_data:
+            print("ERROR: No matching jobs could be analyzed.")
+            return
+    else:
+        # Step 1: Fetch jobs
+        jobs = fetch_job_listings(config)
+        
+        if not jobs:
+            print("ERROR: No jobs found.")
+            return
+        
+        # Step 2: Analyze with Groq
+        skills_data = analyze_skills_with_groq(jobs, config)
+        num_jobs = len(jobs)
+        
+        if not skills_data:
+            print("ERROR: Could not analyze skills. Please check your GROQ_API_KEY.")
+            return
     
     # Step 3: Display report
-    display_skills_report(skills_data, config, num_jobs=len(jobs))
+    display_skills_report(skills_data, config, num_jobs=num_jobs)
     
     # Step 4: Generate challenge
     generate_daily_challenge(skills_data, config)